@@ -1,9 +1,11 @@
 """API handlers - COMPLETELY UNTESTED."""
 
-from .handlers import UserHandler, TaskHandler, ProjectHandler
-from .middleware import AuthMiddleware, RateLimitMiddleware, LoggingMiddleware
+from .handlers import UserHandler, TaskHandler, ProjectHandler, route
+from .middleware import (
+    AuthMiddleware, RateLimitMiddleware, TokenBucketMiddleware, LoggingMiddleware,
+)
 
 __all__ = [
-    "UserHandler", "TaskHandler", "ProjectHandler",
-    "AuthMiddleware", "RateLimitMiddleware", "LoggingMiddleware",
+    "UserHandler", "TaskHandler", "ProjectHandler", "route",
+    "AuthMiddleware", "RateLimitMiddleware", "TokenBucketMiddleware", "LoggingMiddleware",
 ]
@@ -1,80 +1,181 @@
 """API request handlers - COMPLETELY UNTESTED (0% coverage)."""
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, Callable, Tuple
 from datetime import datetime
+import json
+import time
+
+
+# (epoch second, ISO string, JSON-quoted bytes) of the last formatted timestamp;
+# replaced as a whole so readers never see fields from different seconds
+_TS_CACHE: Tuple[int, str, bytes] = (0, "", b'""')
+
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+# Serialized response envelope prefixes, keyed by status code
+_RESPONSE_PREFIXES: Dict[int, bytes] = {}
+
+
+def _refresh_ts_cache() -> Tuple[int, str, bytes]:
+    """Re-format the cached timestamp if the second has changed."""
+    global _TS_CACHE
+    t = int(time.time())
+    cache = _TS_CACHE
+    if cache[0] != t:
+        iso = datetime.utcfromtimestamp(t).isoformat()
+        cache = _TS_CACHE = (t, iso, f'"{iso}"'.encode())
+    return cache
+
+
+def _now_iso() -> str:
+    """Get the current UTC time as an ISO string, re-formatted once per second."""
+    return _refresh_ts_cache()[1]
+
+
+def _now_iso_bytes() -> bytes:
+    """Get the current UTC time as a JSON string literal in bytes."""
+    return _refresh_ts_cache()[2]
+
+
+def _required_fields_validator(*fields: str) -> Callable[[Dict[str, Any]], Optional[str]]:
+    """Build a validator that checks a fixed set of required fields."""
+
+    checks = tuple((field, f"Missing required field: {field}") for field in fields)
+
+    def validate(data: Dict[str, Any]) -> Optional[str]:
+        for field, error in checks:
+            if data.get(field) is None:
+                return error
+        return None
+
+    return validate
+
+
+def route(method: str, path: str) -> Callable[[Callable], Callable]:
+    """Mark a handler method as serving a method and path pattern."""
+
+    def decorator(func: Callable) -> Callable:
+        func._route = (method, path)
+        return func
+
+    return decorator
 
 
 class BaseHandler:
     """Base API handler."""
 
+    __slots__ = ("request_count", "_last_request_ts")
+
+    # (method, path pattern) -> handler function, built per subclass
+    _routes: Dict[Tuple[str, str], Callable] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Collect @route-decorated methods into the class route table."""
+        super().__init_subclass__(**kwargs)
+        routes = dict(cls._routes)
+        for attr in vars(cls).values():
+            key = getattr(attr, "_route", None)
+            if key is not None:
+                routes[key] = attr
+        cls._routes = routes
+
     def __init__(self):
         self.request_count = 0
-        self.last_request_time: Optional[datetime] = None
-
-    def _log_request(self, method: str, path: str) -> None:
+        self._last_request_ts: Optional[float] = None
+
+    @property
+    def last_request_time(self) -> Optional[datetime]:
+        """Time of the last handled request."""
+        if self._last_request_ts is None:
+            return None
+        return datetime.utcfromtimestamp(self._last_request_ts)
+
+    def dispatch(self, method: str, path: str, **params: Any) -> Dict[str, Any]:
+        """Call the handler method registered for a method and path pattern."""
+        handler = self._routes.get((method, path))
+        if handler is None:
+            return self._format_error(f"No route for {method} {path}", status=404)
+        return handler(self, **params)
+
+    def _log_request(self) -> None:
         """Log incoming request."""
         self.request_count += 1
-        self.last_request_time = datetime.utcnow()
-
-    def _validate_request(self, data: Dict[str, Any], required_fields: List[str]) -> Optional[str]:
-        """Validate request data."""
-        for field in required_fields:
-            if field not in data or data[field] is None:
-                return f"Missing required field: {field}"
-        return None
+        self._last_request_ts = time.time()
 
     def _format_response(self, data: Any, status: int = 200) -> Dict[str, Any]:
         """Format API response."""
         return {
             "status": status,
             "data": data,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
         }
 
+    def _format_response_bytes(self, data: Any, status: int = 200) -> bytes:
+        """Format API response as serialized JSON."""
+        prefix = _RESPONSE_PREFIXES.get(status)
+        if prefix is None:
+            prefix = _RESPONSE_PREFIXES[status] = b'{"status":%d,"data":' % status
+        return (
+            prefix
+            + _JSON_ENCODER.encode(data).encode()
+            + b',"timestamp":'
+            + _now_iso_bytes()
+            + b"}"
+        )
+
     def _format_error(self, message: str, status: int = 400) -> Dict[str, Any]:
         """Format error response."""
         return {
             "status": status,
             "error": message,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
         }
 
 
 class UserHandler(BaseHandler):
     """User API handler."""
 
+    __slots__ = ()
+
+    _validate_create = staticmethod(_required_fields_validator("email", "name"))
+
+    @route("GET", "/users")
     def get_users(self, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Get list of users."""
-        self._log_request("GET", "/users")
+        self._log_request()
         # Would fetch from database
         return self._format_response([])
 
+    @route("GET", "/users/{user_id}")
     def get_user(self, user_id: int) -> Dict[str, Any]:
         """Get single user."""
-        self._log_request("GET", f"/users/{user_id}")
+        self._log_request()
         # Would fetch from database
         return self._format_response({"id": user_id})
 
+    @route("POST", "/users")
     def create_user(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create new user."""
-        self._log_request("POST", "/users")
+        self._log_request()
 
-        error = self._validate_request(data, ["email", "name"])
+        error = self._validate_create(data)
         if error:
             return self._format_error(error)
 
         # Would create in database
         return self._format_response(data, status=201)
 
+    @route("PUT", "/users/{user_id}")
     def update_user(self, user_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update user."""
-        self._log_request("PUT", f"/users/{user_id}")
+        self._log_request()
         # Would update in database
         return self._format_response({"id": user_id, **data})
 
+    @route("DELETE", "/users/{user_id}")
     def delete_user(self, user_id: int) -> Dict[str, Any]:
         """Delete user."""
-        self._log_request("DELETE", f"/users/{user_id}")
+        self._log_request()
         # Would delete from database
         return self._format_response(None, status=204)
 
@@ -82,93 +183,116 @@ class UserHandler(BaseHandler):
 class TaskHandler(BaseHandler):
     """Task API handler."""
 
+    __slots__ = ()
+
+    _validate_create = staticmethod(_required_fields_validator("title"))
+
+    @route("GET", "/tasks")
     def get_tasks(self, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Get list of tasks."""
-        self._log_request("GET", "/tasks")
+        self._log_request()
         return self._format_response([])
 
+    @route("GET", "/tasks/{task_id}")
     def get_task(self, task_id: int) -> Dict[str, Any]:
         """Get single task."""
-        self._log_request("GET", f"/tasks/{task_id}")
+        self._log_request()
         return self._format_response({"id": task_id})
 
+    @route("POST", "/tasks")
     def create_task(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create new task."""
-        self._log_request("POST", "/tasks")
+        self._log_request()
 
-        error = self._validate_request(data, ["title"])
+        error = self._validate_create(data)
         if error:
             return self._format_error(error)
 
         return self._format_response(data, status=201)
 
+    @route("PUT", "/tasks/{task_id}")
     def update_task(self, task_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update task."""
-        self._log_request("PUT", f"/tasks/{task_id}")
+        self._log_request()
         return self._format_response({"id": task_id, **data})
 
+    @route("DELETE", "/tasks/{task_id}")
     def delete_task(self, task_id: int) -> Dict[str, Any]:
         """Delete task."""
-        self._log_request("DELETE", f"/tasks/{task_id}")
+        self._log_request()
         return self._format_response(None, status=204)
 
+    @route("POST", "/tasks/{task_id}/assign")
     def assign_task(self, task_id: int, user_id: int) -> Dict[str, Any]:
         """Assign task to user."""
-        self._log_request("POST", f"/tasks/{task_id}/assign")
+        self._log_request()
         return self._format_response({"task_id": task_id, "assignee_id": user_id})
 
+    @route("POST", "/tasks/{task_id}/transition")
     def transition_task(self, task_id: int, status: str) -> Dict[str, Any]:
         """Transition task status."""
-        self._log_request("POST", f"/tasks/{task_id}/transition")
+        self._log_request()
         return self._format_response({"task_id": task_id, "status": status})
 
 
 class ProjectHandler(BaseHandler):
     """Project API handler."""
 
+    __slots__ = ()
+
+    _validate_create = staticmethod(_required_fields_validator("name", "owner_id"))
+
+    @route("GET", "/projects")
     def get_projects(self, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Get list of projects."""
-        self._log_request("GET", "/projects")
+        self._log_request()
         return self._format_response([])
 
+    @route("GET", "/projects/{project_id}")
     def get_project(self, project_id: int) -> Dict[str, Any]:
         """Get single project."""
-        self._log_request("GET", f"/projects/{project_id}")
+        self._log_request()
         return self._format_response({"id": project_id})
 
+    @route("POST", "/projects")
     def create_project(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create new project."""
-        self._log_request("POST", "/projects")
+        self._log_request()
 
-        error = self._validate_request(data, ["name", "owner_id"])
+        error = self._validate_create(data)
         if error:
             return self._format_error(error)
 
         return self._format_response(data, status=201)
 
+    @route("PUT", "/projects/{project_id}")
     def update_project(self, project_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update project."""
-        self._log_request("PUT", f"/projects/{project_id}")
+        self._log_request()
         return self._format_response({"id": project_id, **data})
 
+    @route("DELETE", "/projects/{project_id}")
     def delete_project(self, project_id: int) -> Dict[str, Any]:
         """Delete project."""
-        self._log_request("DELETE", f"/projects/{project_id}")
+        self._log_request()
         return self._format_response(None, status=204)
 
+    @route("POST", "/projects/{project_id}/members")
     def add_member(self, project_id: int, user_id: int) -> Dict[str, Any]:
         """Add member to project."""
-        self._log_request("POST", f"/projects/{project_id}/members")
+        self._log_request()
         return self._format_response({"project_id": project_id, "user_id": user_id})
 
+    @route("DELETE", "/projects/{project_id}/members/{user_id}")
     def remove_member(self, project_id: int, user_id: int) -> Dict[str, Any]:
         """Remove member from project."""
-        self._log_request("DELETE", f"/projects/{project_id}/members/{user_id}")
+        self._log_request()
         return self._format_response(None, status=204)
 
+    @route("GET", "/projects/{project_id}/stats")
     def get_project_stats(self, project_id: int) -> Dict[str, Any]:
         """Get project statistics."""
-        self._log_request("GET", f"/projects/{project_id}/stats")
+        self._log_request()
         return self._format_response({
             "total_tasks": 0,
             "completed_tasks": 0,
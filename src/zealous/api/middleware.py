@@ -1,9 +1,23 @@
 """API middleware - COMPLETELY UNTESTED (0% coverage)."""
 
-from typing import Dict, Any, Optional, Callable
-from datetime import datetime, timedelta
-from collections import defaultdict
+from typing import Dict, Any, Optional, Callable, Deque, List, Set, Tuple
+from datetime import datetime
+from collections import defaultdict, deque
+from itertools import islice
+from math import fsum
+import atexit
 import hashlib
+import heapq
+import logging
+import os
+import struct
+import threading
+import time
+
+
+_LOG_LINE_FORMAT = "[%s] %s %s - %d (%.2fms)"
+
+_logger = logging.getLogger(__name__)
 
 
 class AuthMiddleware:
@@ -11,19 +25,30 @@ class AuthMiddleware:
 
     def __init__(self, secret_key: str):
         self.secret_key = secret_key
+        # blake2b keys are capped at 64 bytes, so derive one from the secret
+        self._token_key = hashlib.blake2b(secret_key.encode()).digest()
         self._sessions: Dict[str, Dict[str, Any]] = {}
+        # Reverse index of user_id -> that user's session tokens
+        self._user_tokens: Dict[int, Set[str]] = defaultdict(set)
+        # Min-heap of (expires_at, token); revoked tokens are skipped lazily
+        self._expiry_heap: List[Tuple[float, str]] = []
 
     def create_session(self, user_id: int, expires_in: int = 3600) -> str:
         """Create a new session."""
-        token = hashlib.sha256(
-            f"{user_id}{datetime.utcnow().isoformat()}{self.secret_key}".encode()
-        ).hexdigest()
+        now = time.monotonic()
+        # The random bytes make tokens unique; user_id stays out so any int works
+        payload = struct.pack("<d", now) + os.urandom(16)
+        token = hashlib.blake2b(payload, digest_size=16, key=self._token_key).hexdigest()
 
+        # Session times are time.monotonic() seconds
+        expires_at = now + expires_in
         self._sessions[token] = {
             "user_id": user_id,
-            "created_at": datetime.utcnow(),
-            "expires_at": datetime.utcnow() + timedelta(seconds=expires_in),
+            "created_at": now,
+            "expires_at": expires_at,
         }
+        self._user_tokens[user_id].add(token)
+        heapq.heappush(self._expiry_heap, (expires_at, token))
 
         return token
 
@@ -33,39 +58,62 @@ class AuthMiddleware:
         if session is None:
             return None
 
-        if datetime.utcnow() > session["expires_at"]:
-            del self._sessions[token]
+        if time.monotonic() > session["expires_at"]:
+            self._drop(token)
             return None
 
         return session["user_id"]
 
     def revoke_session(self, token: str) -> bool:
         """Revoke a session."""
-        if token in self._sessions:
-            del self._sessions[token]
-            return True
-        return False
+        if self._drop(token) is None:
+            return False
+        self._maybe_compact_heap()
+        return True
 
     def revoke_all_sessions(self, user_id: int) -> int:
         """Revoke all sessions for a user."""
-        tokens_to_remove = [
-            token for token, session in self._sessions.items()
-            if session["user_id"] == user_id
-        ]
+        tokens_to_remove = self._user_tokens.pop(user_id, ())
         for token in tokens_to_remove:
             del self._sessions[token]
+        self._maybe_compact_heap()
         return len(tokens_to_remove)
 
     def cleanup_expired_sessions(self) -> int:
         """Remove expired sessions."""
-        now = datetime.utcnow()
-        tokens_to_remove = [
-            token for token, session in self._sessions.items()
-            if now > session["expires_at"]
+        now = time.monotonic()
+        heap = self._expiry_heap
+        removed = 0
+        while heap and heap[0][0] < now:
+            _, token = heapq.heappop(heap)
+            session = self._sessions.get(token)
+            if session is not None and now > session["expires_at"]:
+                self._drop(token)
+                removed += 1
+        return removed
+
+    def _maybe_compact_heap(self) -> None:
+        """Rebuild the expiry heap once revoked entries dominate it."""
+        if len(self._expiry_heap) <= 2 * len(self._sessions) + 64:
+            return
+        self._expiry_heap = [
+            (session["expires_at"], token) for token, session in self._sessions.items()
         ]
-        for token in tokens_to_remove:
-            del self._sessions[token]
-        return len(tokens_to_remove)
+        heapq.heapify(self._expiry_heap)
+
+    def _drop(self, token: str) -> Optional[Dict[str, Any]]:
+        """Remove a session and its user index entry."""
+        session = self._sessions.pop(token, None)
+        if session is None:
+            return None
+
+        user_id = session["user_id"]
+        tokens = self._user_tokens.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._user_tokens[user_id]
+        return session
 
 
 class RateLimitMiddleware:
@@ -73,61 +121,129 @@ class RateLimitMiddleware:
 
     def __init__(self, requests_per_minute: int = 60):
         self.requests_per_minute = requests_per_minute
-        self._request_counts: Dict[str, list] = defaultdict(list)
+        # Per-client request times (monotonic seconds), oldest first; a request is
+        # only recorded while the client is under the limit, so these stay bounded
+        self._request_counts: Dict[str, Deque[float]] = defaultdict(deque)
+        # Number of timestamps currently held across all clients
+        self._total_recent = 0
+
+    def _prune(self, timestamps: Deque[float], minute_ago: float) -> None:
+        """Drop requests that fell out of the window."""
+        while timestamps and timestamps[0] <= minute_ago:
+            timestamps.popleft()
+            self._total_recent -= 1
 
     def is_rate_limited(self, client_id: str) -> bool:
         """Check if client is rate limited."""
-        now = datetime.utcnow()
-        minute_ago = now - timedelta(minutes=1)
+        now = time.monotonic()
 
-        # Clean old requests
-        self._request_counts[client_id] = [
-            ts for ts in self._request_counts[client_id]
-            if ts > minute_ago
-        ]
+        timestamps = self._request_counts[client_id]
+        self._prune(timestamps, now - 60)
 
         # Check limit
-        if len(self._request_counts[client_id]) >= self.requests_per_minute:
+        if len(timestamps) >= self.requests_per_minute:
             return True
 
         # Record request
-        self._request_counts[client_id].append(now)
+        timestamps.append(now)
+        self._total_recent += 1
         return False
 
     def get_remaining_requests(self, client_id: str) -> int:
         """Get remaining requests for client."""
-        now = datetime.utcnow()
-        minute_ago = now - timedelta(minutes=1)
+        minute_ago = time.monotonic() - 60
 
-        current_count = len([
-            ts for ts in self._request_counts[client_id]
-            if ts > minute_ago
-        ])
+        timestamps = self._request_counts[client_id]
+        self._prune(timestamps, minute_ago)
 
-        return max(0, self.requests_per_minute - current_count)
+        return max(0, self.requests_per_minute - len(timestamps))
 
     def reset_client(self, client_id: str) -> None:
         """Reset rate limit for a client."""
-        if client_id in self._request_counts:
-            del self._request_counts[client_id]
+        timestamps = self._request_counts.pop(client_id, None)
+        if timestamps is not None:
+            self._total_recent -= len(timestamps)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get rate limiting statistics."""
-        now = datetime.utcnow()
-        minute_ago = now - timedelta(minutes=1)
+        minute_ago = time.monotonic() - 60
 
-        active_clients = 0
-        total_requests = 0
+        idle_clients = []
 
         for client_id, timestamps in self._request_counts.items():
-            recent = [ts for ts in timestamps if ts > minute_ago]
-            if recent:
-                active_clients += 1
-                total_requests += len(recent)
+            self._prune(timestamps, minute_ago)
+            if not timestamps:
+                idle_clients.append(client_id)
+
+        # Forget idle clients so later sweeps only visit active ones
+        for client_id in idle_clients:
+            del self._request_counts[client_id]
+        active_clients = len(self._request_counts)
 
         return {
             "active_clients": active_clients,
-            "total_requests_last_minute": total_requests,
+            "total_requests_last_minute": self._total_recent,
+            "limit_per_minute": self.requests_per_minute,
+        }
+
+
+class TokenBucketMiddleware:
+    """Token-bucket rate limiting middleware."""
+
+    def __init__(self, requests_per_minute: int = 60):
+        self.requests_per_minute = requests_per_minute
+        # Buckets hold up to requests_per_minute tokens and refill continuously
+        self._rate = requests_per_minute / 60.0
+        # client_id -> (tokens, last refill time in monotonic seconds)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def _refill(self, client_id: str, now: float) -> float:
+        """Get the client's token count refilled up to now."""
+        bucket = self._buckets.get(client_id)
+        if bucket is None:
+            return float(self.requests_per_minute)
+        tokens, last = bucket
+        return min(self.requests_per_minute, tokens + (now - last) * self._rate)
+
+    def is_rate_limited(self, client_id: str) -> bool:
+        """Check if client is rate limited."""
+        now = time.monotonic()
+        tokens = self._refill(client_id, now)
+
+        if tokens < 1.0:
+            self._buckets[client_id] = (tokens, now)
+            return True
+
+        self._buckets[client_id] = (tokens - 1.0, now)
+        return False
+
+    def get_remaining_requests(self, client_id: str) -> int:
+        """Get remaining requests for client."""
+        return int(self._refill(client_id, time.monotonic()))
+
+    def reset_client(self, client_id: str) -> None:
+        """Reset rate limit for a client."""
+        self._buckets.pop(client_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get rate limiting statistics."""
+        now = time.monotonic()
+        limited = 0
+        full_clients = []
+        for client_id in self._buckets:
+            tokens = self._refill(client_id, now)
+            if tokens < 1.0:
+                limited += 1
+            elif tokens >= self.requests_per_minute:
+                full_clients.append(client_id)
+
+        # A full bucket is the same as no bucket, so forget those clients
+        for client_id in full_clients:
+            del self._buckets[client_id]
+
+        return {
+            "tracked_clients": len(self._buckets),
+            "limited_clients": limited,
             "limit_per_minute": self.requests_per_minute,
         }
 
@@ -135,9 +251,45 @@ class RateLimitMiddleware:
 class LoggingMiddleware:
     """Request logging middleware."""
 
-    def __init__(self, log_function: Optional[Callable] = None):
+    def __init__(
+        self,
+        log_function: Optional[Callable] = None,
+        flush_interval: Optional[float] = None,
+        max_batch_size: int = 100,
+        max_entries: int = 10_000,
+        disable_console: bool = False,
+        logger: Optional[logging.Logger] = None,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if flush_interval is not None and flush_interval <= 0:
+            raise ValueError("flush_interval must be positive")
         self.log_function = log_function or print
-        self._request_log: list = []
+        # A logger takes over from log_function and formats lines lazily
+        self.logger = logger
+        self.disable_console = disable_console
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        # Oldest entries are dropped once max_entries are retained
+        self._request_log: Deque[Dict[str, Any]] = deque(maxlen=max_entries)
+        # Columnar copies of the numeric fields, used for stats
+        self._durations: Deque[float] = deque(maxlen=max_entries)
+        self._statuses: Deque[int] = deque(maxlen=max_entries)
+        # Number of retained entries with status >= 400
+        self._error_count = 0
+
+        # With a flush interval, lines are buffered and written in batches
+        # by a background thread instead of one log_function call each.
+        # The thread is only started once there is a line to write.
+        self._pending_lines: Deque[str] = deque()
+        # Guards the flush thread's lifecycle; never held while writing
+        self._flush_lock = threading.Lock()
+        # Serializes log_function calls so batches are written in order
+        self._write_lock = threading.Lock()
+        self._flush_event = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        # Set by close() to tell the current flush thread to exit
+        self._flusher_stop = threading.Event()
 
     def log_request(
         self,
@@ -148,8 +300,10 @@ class LoggingMiddleware:
         duration_ms: float,
     ) -> None:
         """Log a request."""
+        ts = time.time()
+        # The ISO timestamp is only formatted when the entry is read
         entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "ts": ts,
             "method": method,
             "path": path,
             "client_id": client_id,
@@ -157,14 +311,94 @@ class LoggingMiddleware:
             "duration_ms": duration_ms,
         }
 
+        # Account for the entry the bounded deques are about to evict
+        statuses = self._statuses
+        if len(statuses) == statuses.maxlen and statuses[0] >= 400:
+            self._error_count -= 1
+        if status >= 400:
+            self._error_count += 1
+
         self._request_log.append(entry)
-        self.log_function(
-            f"[{entry['timestamp']}] {method} {path} - {status} ({duration_ms:.2f}ms)"
-        )
+        self._durations.append(duration_ms)
+        statuses.append(status)
+
+        if self.disable_console:
+            return
+
+        logger = self.logger
+        if logger is not None:
+            if logger.isEnabledFor(logging.INFO):
+                timestamp = datetime.utcfromtimestamp(ts).isoformat()
+                logger.info(_LOG_LINE_FORMAT, timestamp, method, path, status, duration_ms)
+            return
+
+        timestamp = datetime.utcfromtimestamp(ts).isoformat()
+        line = _LOG_LINE_FORMAT % (timestamp, method, path, status, duration_ms)
+        if self.flush_interval is None:
+            self.log_function(line)
+            return
+
+        self._pending_lines.append(line)
+        if self._flusher is None:
+            self._start_flusher()
+        if len(self._pending_lines) >= self.max_batch_size:
+            self._flush_event.set()
+
+    def _start_flusher(self) -> None:
+        """Start the background flush thread if it is not running yet."""
+        with self._flush_lock:
+            if self._flusher is not None:
+                return
+            self._flusher_stop = threading.Event()
+            self._flusher = threading.Thread(
+                target=self._drain, args=(self._flusher_stop,), daemon=True
+            )
+            self._flusher.start()
+            atexit.register(self.flush)
+
+    def close(self) -> None:
+        """Stop the background flush thread and write any buffered lines."""
+        with self._flush_lock:
+            flusher, self._flusher = self._flusher, None
+            stop = self._flusher_stop
+        if flusher is not None:
+            stop.set()
+            self._flush_event.set()
+            flusher.join()
+            atexit.unregister(self.flush)
+        self.flush()
+
+    def flush(self) -> int:
+        """Write buffered log lines in batches."""
+        written = 0
+        pending = self._pending_lines
+        with self._write_lock:
+            while pending:
+                batch = []
+                while pending and len(batch) < self.max_batch_size:
+                    batch.append(pending.popleft())
+                self.log_function("\n".join(batch))
+                written += len(batch)
+        return written
+
+    def _drain(self, stop: threading.Event) -> None:
+        """Background loop flushing buffered lines until stopped."""
+        while not stop.is_set():
+            self._flush_event.wait(self.flush_interval)
+            self._flush_event.clear()
+            try:
+                self.flush()
+            except Exception:
+                # Keep draining; the failed batch is dropped rather than retried forever
+                _logger.exception("Failed to write buffered request log lines")
 
     def get_recent_requests(self, limit: int = 100) -> list:
         """Get recent requests."""
-        return self._request_log[-limit:]
+        start = max(0, len(self._request_log) - limit)
+        return [
+            {"timestamp": datetime.utcfromtimestamp(entry["ts"]).isoformat(), **entry}
+            for entry in islice(self._request_log, start, None)
+        ]
 
     def get_request_stats(self) -> Dict[str, Any]:
         """Get request statistics."""
@@ -175,13 +409,13 @@ class LoggingMiddleware:
                 "error_rate": 0,
             }
 
-        total = len(self._request_log)
-        durations = [r["duration_ms"] for r in self._request_log]
-        errors = len([r for r in self._request_log if r["status"] >= 400])
+        total = len(self._durations)
+        durations = self._durations
+        errors = self._error_count
 
         return {
             "total_requests": total,
-            "avg_duration_ms": sum(durations) / total,
+            "avg_duration_ms": fsum(durations) / total,
             "min_duration_ms": min(durations),
             "max_duration_ms": max(durations),
             "error_rate": errors / total if total > 0 else 0,
@@ -190,5 +424,8 @@ class LoggingMiddleware:
     def clear_log(self) -> int:
         """Clear request log."""
         count = len(self._request_log)
-        self._request_log = []
+        self._request_log.clear()
+        self._durations.clear()
+        self._statuses.clear()
+        self._error_count = 0
         return count
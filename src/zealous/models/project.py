@@ -2,10 +2,13 @@
 
 from enum import Enum
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 
 
+_SLACK_WEBHOOK_PREFIX = "https://hooks.slack.com/"
+
+
 class ProjectStatus(str, Enum):
     PLANNING = "planning"
     ACTIVE = "active"
@@ -22,9 +25,17 @@ class ProjectSettings(BaseModel):
     slack_webhook: Optional[str] = None
     custom_fields: Dict[str, Any] = Field(default_factory=dict)
 
+    @field_validator("slack_webhook")
+    @classmethod
+    def _check_slack_webhook(cls, value: Optional[str]) -> Optional[str]:
+        """Validate the Slack webhook URL once, when the settings are built."""
+        if value is not None and not value.startswith(_SLACK_WEBHOOK_PREFIX):
+            raise ValueError("Invalid Slack webhook URL")
+        return value
+
     def enable_slack_notifications(self, webhook_url: str) -> None:
         """Enable Slack notifications."""
-        if not webhook_url.startswith("https://hooks.slack.com/"):
+        if not webhook_url.startswith(_SLACK_WEBHOOK_PREFIX):
             raise ValueError("Invalid Slack webhook URL")
         self.slack_webhook = webhook_url
 
@@ -42,8 +53,7 @@ class ProjectSettings(BaseModel):
 
     def remove_custom_field(self, name: str) -> None:
         """Remove a custom field."""
-        if name in self.custom_fields:
-            del self.custom_fields[name]
+        self.custom_fields.pop(name, None)
 
 
 class Project(BaseModel):
@@ -117,10 +127,11 @@ class Project(BaseModel):
         """Activate the project."""
         if self.status == ProjectStatus.ARCHIVED:
             raise ValueError("Cannot activate archived project")
+        now = datetime.utcnow()
         self.status = ProjectStatus.ACTIVE
         if self.start_date is None:
-            self.start_date = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
+            self.start_date = now
+        self.updated_at = now
 
     def put_on_hold(self) -> None:
         """Put project on hold."""
@@ -131,9 +142,10 @@ class Project(BaseModel):
 
     def complete(self) -> None:
         """Mark project as completed."""
+        now = datetime.utcnow()
         self.status = ProjectStatus.COMPLETED
-        self.end_date = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
+        self.end_date = now
+        self.updated_at = now
 
     def archive(self) -> None:
         """Archive the project."""
@@ -1,9 +1,10 @@
 """Task model - PARTIALLY TESTED (medium coverage expected)."""
 
 from enum import Enum
-from typing import Optional, List
-from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, FrozenSet, Iterable
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime, timedelta
+import sys
 
 
 class TaskStatus(str, Enum):
@@ -22,7 +23,36 @@ class TaskPriority(str, Enum):
     LOW = "low"
 
 
+def _normalize_tag(tag: str) -> str:
+    """Lowercase and strip a tag, skipping the copies if it is already normal."""
+    if not tag.islower() or tag[0].isspace() or tag[-1].isspace():
+        tag = tag.lower().strip()
+    return sys.intern(tag)
+
+
+_NO_TRANSITIONS: FrozenSet[TaskStatus] = frozenset()
+
+_VALID_TRANSITIONS: Dict[TaskStatus, FrozenSet[TaskStatus]] = {
+    TaskStatus.TODO: frozenset((TaskStatus.IN_PROGRESS, TaskStatus.CANCELLED)),
+    TaskStatus.IN_PROGRESS: frozenset((TaskStatus.IN_REVIEW, TaskStatus.BLOCKED, TaskStatus.CANCELLED)),
+    TaskStatus.IN_REVIEW: frozenset((TaskStatus.DONE, TaskStatus.IN_PROGRESS)),
+    TaskStatus.BLOCKED: frozenset((TaskStatus.IN_PROGRESS, TaskStatus.CANCELLED)),
+    TaskStatus.DONE: _NO_TRANSITIONS,
+    TaskStatus.CANCELLED: _NO_TRANSITIONS,
+}
+
+# Fallback progress for in-flight statuses when hours are not tracked
+_STATUS_PROGRESS: Dict[TaskStatus, float] = {
+    TaskStatus.IN_PROGRESS: 25.0,
+    TaskStatus.IN_REVIEW: 75.0,
+    TaskStatus.BLOCKED: 50.0,
+}
+
+
 class Task(BaseModel):
+    # Build the validator on first use rather than at import
+    model_config = ConfigDict(defer_build=True)
+
     id: Optional[int] = None
     title: str
     description: Optional[str] = None
@@ -48,6 +78,15 @@ class Task(BaseModel):
             return False
         return datetime.utcnow() > self.due_date
 
+    @classmethod
+    def bulk_overdue(cls, tasks: Iterable["Task"]) -> List[bool]:
+        """Check many tasks for being overdue against a single clock read."""
+        now = datetime.utcnow()
+        return [
+            t.due_date is not None and t.status != TaskStatus.DONE and now > t.due_date
+            for t in tasks
+        ]
+
     def is_blocked(self) -> bool:
         """Check if task is blocked."""
         return self.status == TaskStatus.BLOCKED
@@ -58,26 +97,20 @@ class Task(BaseModel):
 
     def can_transition_to(self, new_status: TaskStatus) -> bool:
         """Check if task can transition to new status."""
-        valid_transitions = {
-            TaskStatus.TODO: [TaskStatus.IN_PROGRESS, TaskStatus.CANCELLED],
-            TaskStatus.IN_PROGRESS: [TaskStatus.IN_REVIEW, TaskStatus.BLOCKED, TaskStatus.CANCELLED],
-            TaskStatus.IN_REVIEW: [TaskStatus.DONE, TaskStatus.IN_PROGRESS],
-            TaskStatus.BLOCKED: [TaskStatus.IN_PROGRESS, TaskStatus.CANCELLED],
-            TaskStatus.DONE: [],
-            TaskStatus.CANCELLED: [],
-        }
-        return new_status in valid_transitions.get(self.status, [])
+        return new_status in _VALID_TRANSITIONS.get(self.status, _NO_TRANSITIONS)
 
     def transition_to(self, new_status: TaskStatus) -> None:
         """Transition task to new status."""
-        if not self.can_transition_to(new_status):
+        # Same check as can_transition_to, inlined to skip the method call
+        if new_status not in _VALID_TRANSITIONS.get(self.status, _NO_TRANSITIONS):
             raise ValueError(f"Cannot transition from {self.status} to {new_status}")
 
+        now = datetime.utcnow()
         self.status = new_status
-        self.updated_at = datetime.utcnow()
+        self.updated_at = now
 
         if new_status == TaskStatus.DONE:
-            self.completed_at = datetime.utcnow()
+            self.completed_at = now
 
     def add_subtask(self, subtask_id: int) -> None:
         """Add a subtask."""
@@ -93,14 +126,31 @@ class Task(BaseModel):
 
     def add_tag(self, tag: str) -> None:
         """Add a tag to the task."""
-        tag = tag.lower().strip()
+        tag = _normalize_tag(tag)
         if tag and tag not in self.tags:
             self.tags.append(tag)
             self.updated_at = datetime.utcnow()
 
+    @staticmethod
+    def normalize_tags(tags: Iterable[str]) -> List[str]:
+        """Normalize tags in order, dropping empty and repeated ones."""
+        normalized: List[str] = []
+        for tag in tags:
+            tag = _normalize_tag(tag)
+            if tag and tag not in normalized:
+                normalized.append(tag)
+        return normalized
+
+    def add_tags(self, tags: Iterable[str]) -> None:
+        """Add several tags to the task."""
+        new_tags = [tag for tag in self.normalize_tags(tags) if tag not in self.tags]
+        if new_tags:
+            self.tags.extend(new_tags)
+            self.updated_at = datetime.utcnow()
+
     def remove_tag(self, tag: str) -> None:
         """Remove a tag from the task."""
-        tag = tag.lower().strip()
+        tag = _normalize_tag(tag)
         if tag in self.tags:
             self.tags.remove(tag)
             self.updated_at = datetime.utcnow()
@@ -122,12 +172,7 @@ class Task(BaseModel):
         if self.status == TaskStatus.TODO:
             return 0.0
         if self.estimated_hours is None or self.actual_hours is None:
-            status_progress = {
-                TaskStatus.IN_PROGRESS: 25.0,
-                TaskStatus.IN_REVIEW: 75.0,
-                TaskStatus.BLOCKED: 50.0,
-            }
-            return status_progress.get(self.status, 0.0)
+            return _STATUS_PROGRESS.get(self.status, 0.0)
 
         progress = (self.actual_hours / self.estimated_hours) * 100
         return min(99.0, progress)  # Cap at 99% until done
@@ -1,8 +1,8 @@
 """User model - WELL TESTED (high coverage expected)."""
 
 from enum import Enum
-from typing import Optional
-from pydantic import BaseModel, EmailStr, Field
+from typing import Dict, Optional
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from datetime import datetime
 
 
@@ -20,7 +20,23 @@ class UserStatus(str, Enum):
     SUSPENDED = "suspended"
 
 
+# Permission bits granted by each role
+_IS_ADMIN = 0b100
+_CAN_MANAGE_USERS = 0b010
+_CAN_EDIT_TASKS = 0b001
+
+_ROLE_PERMISSIONS: Dict[UserRole, int] = {
+    UserRole.ADMIN: _IS_ADMIN | _CAN_MANAGE_USERS | _CAN_EDIT_TASKS,
+    UserRole.MANAGER: _CAN_MANAGE_USERS | _CAN_EDIT_TASKS,
+    UserRole.DEVELOPER: _CAN_EDIT_TASKS,
+    UserRole.VIEWER: 0,
+}
+
+
 class User(BaseModel):
+    # Build the validator on first use rather than at import
+    model_config = ConfigDict(defer_build=True)
+
     id: Optional[int] = None
     email: str
     name: str
@@ -31,7 +47,7 @@ class User(BaseModel):
 
     def is_admin(self) -> bool:
         """Check if user is an admin."""
-        return self.role == UserRole.ADMIN
+        return bool(_ROLE_PERMISSIONS[self.role] & _IS_ADMIN)
 
     def is_active(self) -> bool:
         """Check if user is active."""
@@ -39,11 +55,11 @@ class User(BaseModel):
 
     def can_manage_users(self) -> bool:
         """Check if user can manage other users."""
-        return self.role in (UserRole.ADMIN, UserRole.MANAGER)
+        return bool(_ROLE_PERMISSIONS[self.role] & _CAN_MANAGE_USERS)
 
     def can_edit_tasks(self) -> bool:
         """Check if user can edit tasks."""
-        return self.role != UserRole.VIEWER
+        return bool(_ROLE_PERMISSIONS[self.role] & _CAN_EDIT_TASKS)
 
     def activate(self) -> None:
         """Activate the user."""
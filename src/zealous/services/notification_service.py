@@ -1,13 +1,25 @@
 """Notification service - COMPLETELY UNTESTED (0% coverage expected)."""
 
-from typing import List, Dict, Optional
+from typing import AsyncIterator, Deque, List, Dict, FrozenSet, Optional, Sequence, Tuple
+from collections import OrderedDict, defaultdict, deque
+from contextlib import asynccontextmanager
 from datetime import datetime
 import asyncio
+import json
+import time
+
+
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+# Channels used for users who have not set preferences
+_DEFAULT_CHANNELS: Tuple[str, ...] = ("email",)
 
 
 class NotificationChannel:
     """Base notification channel."""
 
+    __slots__ = ()
+
     async def send(self, recipient: str, subject: str, body: str) -> bool:
         """Send notification."""
         raise NotImplementedError
@@ -16,6 +28,8 @@ class NotificationChannel:
 class EmailChannel(NotificationChannel):
     """Email notification channel."""
 
+    __slots__ = ("smtp_host", "smtp_port", "username", "password")
+
     def __init__(self, smtp_host: str, smtp_port: int, username: str, password: str):
         self.smtp_host = smtp_host
         self.smtp_port = smtp_port
@@ -32,6 +46,8 @@ class EmailChannel(NotificationChannel):
 class SlackChannel(NotificationChannel):
     """Slack notification channel."""
 
+    __slots__ = ("webhook_url",)
+
     def __init__(self, webhook_url: str):
         self.webhook_url = webhook_url
 
@@ -45,6 +61,8 @@ class SlackChannel(NotificationChannel):
 class SMSChannel(NotificationChannel):
     """SMS notification channel."""
 
+    __slots__ = ("api_key", "from_number")
+
     def __init__(self, api_key: str, from_number: str):
         self.api_key = api_key
         self.from_number = from_number
@@ -59,10 +77,95 @@ class SMSChannel(NotificationChannel):
 class NotificationService:
     """Service for sending notifications across multiple channels."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrency: int = 32,
+        channel_limits: Optional[Dict[str, Tuple[int, float]]] = None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        # channel name -> (max sends, window in seconds); unlisted channels are unlimited
+        self.channel_limits = dict(channel_limits or {})
+        for channel_name, (max_sends, window) in self.channel_limits.items():
+            if max_sends < 1:
+                raise ValueError(f"channel_limits[{channel_name!r}] must allow at least 1 send")
+            if window <= 0:
+                raise ValueError(f"channel_limits[{channel_name!r}] window must be positive")
+        # Per-channel send times (monotonic seconds), oldest first
+        self._channel_sends: Dict[str, Deque[float]] = defaultdict(deque)
+        # Upper bound on notifications being delivered at once
+        self.max_concurrency = max_concurrency
+        self._in_flight = 0
+        # Created on first use, since it must belong to the running event loop
+        self._admission: Optional[asyncio.Condition] = None
+        self._admission_loop: Optional[asyncio.AbstractEventLoop] = None
         self._channels: Dict[str, NotificationChannel] = {}
         self._notification_history: List[Dict] = []
-        self._preferences: Dict[str, List[str]] = {}
+        # Per-user view of the history, in the same order
+        self._history_by_user: Dict[str, List[Dict]] = defaultdict(list)
+        # channel -> {"sent": n, "failed": n}, updated as results are logged
+        self._delivery_stats: Dict[str, Dict[str, int]] = {}
+        self._preferences: Dict[str, Tuple[str, ...]] = {}
+        # Channels that delivered recent sends made with an idempotency key, oldest first
+        self._idempotent_delivered: "OrderedDict[str, FrozenSet[str]]" = OrderedDict()
+        self.max_idempotency_keys = 10_000
+        # Sends with an idempotency key that are still going out
+        self._idempotent_in_flight: Dict[str, "asyncio.Future[Dict[str, bool]]"] = {}
+
+    def _get_admission(self) -> asyncio.Condition:
+        """Get the admission condition for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._admission is None or self._admission_loop is not loop:
+            self._admission = asyncio.Condition()
+            self._admission_loop = loop
+            self._in_flight = 0
+        return self._admission
+
+    @asynccontextmanager
+    async def _admitted(self) -> AsyncIterator[None]:
+        """Wait for a delivery slot and hold it for the duration of the block."""
+        admission = self._get_admission()
+        async with admission:
+            while self._in_flight >= self.max_concurrency:
+                try:
+                    await admission.wait()
+                except asyncio.CancelledError:
+                    # A wakeup taken just before the cancel would otherwise be lost
+                    admission.notify()
+                    raise
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with admission:
+                self._in_flight -= 1
+                admission.notify()
+
+    async def set_max_concurrency(self, max_concurrency: int) -> None:
+        """Change how many notifications may be delivered at once."""
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        admission = self._get_admission()
+        async with admission:
+            self.max_concurrency = max_concurrency
+            admission.notify_all()
+
+    async def _acquire(self, channel_name: str) -> None:
+        """Wait until the channel's send window has room for one more send."""
+        limit = self.channel_limits.get(channel_name)
+        if limit is None:
+            return
+
+        max_sends, window = limit
+        sends = self._channel_sends[channel_name]
+        while True:
+            now = time.monotonic()
+            while sends and sends[0] <= now - window:
+                sends.popleft()
+            if len(sends) < max_sends:
+                sends.append(now)
+                return
+            await asyncio.sleep(sends[0] + window - now)
 
     def register_channel(self, name: str, channel: NotificationChannel) -> None:
         """Register a notification channel."""
@@ -70,18 +173,16 @@ class NotificationService:
 
     def unregister_channel(self, name: str) -> bool:
         """Unregister a notification channel."""
-        if name in self._channels:
-            del self._channels[name]
-            return True
-        return False
+        return self._channels.pop(name, None) is not None
 
-    def set_user_preferences(self, user_id: str, channels: List[str]) -> None:
+    def set_user_preferences(self, user_id: str, channels: Sequence[str]) -> None:
         """Set user notification preferences."""
-        self._preferences[user_id] = channels
+        # Stored as a tuple so every send can share it without copying
+        self._preferences[user_id] = tuple(channels)
 
-    def get_user_preferences(self, user_id: str) -> List[str]:
+    def get_user_preferences(self, user_id: str) -> Sequence[str]:
         """Get user notification preferences."""
-        return self._preferences.get(user_id, ["email"])
+        return self._preferences.get(user_id, _DEFAULT_CHANNELS)
 
     async def send_notification(
         self,
@@ -89,56 +190,195 @@ class NotificationService:
         subject: str,
         body: str,
         recipient: str,
-        channels: Optional[List[str]] = None,
+        channels: Optional[Sequence[str]] = None,
+        idempotency_key: Optional[str] = None,
+        first_success: bool = False,
     ) -> Dict[str, bool]:
         """Send notification to user via preferred channels."""
         if channels is None:
             channels = self.get_user_preferences(user_id)
-
-        results = {}
-        for channel_name in channels:
-            if channel_name not in self._channels:
-                results[channel_name] = False
-                continue
-
-            channel = self._channels[channel_name]
+        if idempotency_key is None:
+            return await self._deliver(user_id, subject, body, recipient, channels, first_success)
+
+        # The same send is already going out; share its outcome instead of sending twice
+        while True:
+            in_flight = self._idempotent_in_flight.get(idempotency_key)
+            if in_flight is None:
+                break
             try:
-                success = await channel.send(recipient, subject, body)
-                results[channel_name] = success
-            except Exception:
-                results[channel_name] = False
+                return dict(await asyncio.shield(in_flight))
+            except asyncio.CancelledError:
+                # Only retry if the other send was cancelled, not this one
+                if not in_flight.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._idempotent_in_flight[idempotency_key] = future
+        try:
+            results = await self._deliver_idempotent(
+                idempotency_key, user_id, subject, body, recipient, channels, first_success
+            )
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._idempotent_in_flight[idempotency_key]
+        future.set_result(results)
+        return dict(results)
+
+    async def _deliver_idempotent(
+        self,
+        idempotency_key: str,
+        user_id: str,
+        subject: str,
+        body: str,
+        recipient: str,
+        channels: Sequence[str],
+        first_success: bool,
+    ) -> Dict[str, bool]:
+        """Deliver a keyed send, skipping channels an earlier attempt already reached."""
+        delivered = self._idempotent_delivered.get(idempotency_key, frozenset())
+        if delivered:
+            self._idempotent_delivered.move_to_end(idempotency_key)
+
+        outcomes = {name: True for name in channels if name in delivered}
+        pending = [name for name in channels if name not in delivered]
+        # Failed channels are sent again; with first_success one delivery is enough
+        if pending and not (first_success and outcomes):
+            outcomes.update(
+                await self._deliver(user_id, subject, body, recipient, pending, first_success)
+            )
+        results = {name: outcomes[name] for name in channels if name in outcomes}
+
+        delivered = delivered.union(name for name, success in results.items() if success)
+        if delivered:
+            self._idempotent_delivered[idempotency_key] = delivered
+            if len(self._idempotent_delivered) > self.max_idempotency_keys:
+                self._idempotent_delivered.popitem(last=False)
+        return results
 
-        # Log notification
-        self._notification_history.append({
+    async def _deliver(
+        self,
+        user_id: str,
+        subject: str,
+        body: str,
+        recipient: str,
+        channels: Sequence[str],
+        first_success: bool,
+    ) -> Dict[str, bool]:
+        """Send through the given channels and log the outcome."""
+        known = [(name, self._channels.get(name)) for name in channels]
+        known = [(name, channel) for name, channel in known if channel is not None]
+        # Wait out rate limits before taking a slot, so a throttled channel
+        # does not hold one of the max_concurrency slots while it sleeps
+        await asyncio.gather(*(self._acquire(name) for name, _ in known))
+        # Channels are independent, so their sends overlap instead of running in turn
+        async with self._admitted():
+            if first_success:
+                sent = await self._send_first_success(known, recipient, subject, body)
+            else:
+                outcomes = await asyncio.gather(*(
+                    self._try_send(channel, recipient, subject, body) for _, channel in known
+                ))
+                sent = {name: success for (name, _), success in zip(known, outcomes)}
+
+        reported = channels
+        if first_success:
+            # Channels cancelled once another one succeeded were never attempted
+            attempted = {name for name, _ in known}
+            reported = [name for name in channels if name in sent or name not in attempted]
+        results = {name: sent.get(name, False) for name in reported}
+
+        # Log notification; the ISO timestamp is only formatted when read
+        entry = {
             "user_id": user_id,
             "subject": subject,
             "channels": channels,
             "results": results,
-            "timestamp": datetime.utcnow().isoformat(),
-        })
+            "ts": time.time(),
+        }
+        self._notification_history.append(entry)
+        self._history_by_user[user_id].append(entry)
+
+        stats = self._delivery_stats
+        for channel_name, success in results.items():
+            counts = stats.get(channel_name)
+            if counts is None:
+                counts = stats[channel_name] = {"sent": 0, "failed": 0}
+            counts["sent" if success else "failed"] += 1
 
         return results
 
+    async def _try_send(
+        self,
+        channel: NotificationChannel,
+        recipient: str,
+        subject: str,
+        body: str,
+    ) -> bool:
+        """Send through a channel, counting any error as a failed delivery."""
+        try:
+            return await channel.send(recipient, subject, body)
+        except Exception:
+            return False
+
+    async def _send_first_success(
+        self,
+        known: List[Tuple[str, NotificationChannel]],
+        recipient: str,
+        subject: str,
+        body: str,
+    ) -> Dict[str, bool]:
+        """Send through channels concurrently until one succeeds, cancelling the rest."""
+        pending = {
+            asyncio.ensure_future(self._try_send(channel, recipient, subject, body)): name
+            for name, channel in known
+        }
+        sent: Dict[str, bool] = {}
+        try:
+            while pending:
+                done, _ = await asyncio.wait(set(pending), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    sent[pending.pop(task)] = task.result()
+                if any(sent.values()):
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+        return sent
+
     async def send_bulk_notification(
         self,
         user_ids: List[str],
         subject: str,
         body: str,
         recipients: Dict[str, str],
+        idempotency_key: Optional[str] = None,
     ) -> Dict[str, Dict[str, bool]]:
         """Send notification to multiple users."""
-        results = {}
-        tasks = []
-
-        for user_id in user_ids:
-            recipient = recipients.get(user_id, "")
-            if recipient:
-                task = self.send_notification(user_id, subject, body, recipient)
-                tasks.append((user_id, task))
-
-        for user_id, task in tasks:
-            results[user_id] = await task
+        targets = [(user_id, recipients.get(user_id, "")) for user_id in user_ids]
+        targets = [(user_id, recipient) for user_id, recipient in targets if recipient]
+
+        # Users are independent, so their sends overlap instead of running in turn;
+        # send_notification keeps at most max_concurrency of them in flight
+        # Each user's send is keyed separately so a retry only skips users already sent to
+        user_keys: Dict[str, str] = {}
+        if idempotency_key is not None:
+            user_keys = {user_id: f"{idempotency_key}:{user_id}" for user_id, _ in targets}
+
+        sends = [
+            self.send_notification(
+                user_id, subject, body, recipient, idempotency_key=user_keys.get(user_id)
+            )
+            for user_id, recipient in targets
+        ]
+        outcomes = await asyncio.gather(*sends, return_exceptions=True)
 
+        results = {}
+        for (user_id, _), outcome in zip(targets, outcomes):
+            if isinstance(outcome, BaseException):
+                outcome = {channel: False for channel in self.get_user_preferences(user_id)}
+            results[user_id] = outcome
         return results
 
     def get_notification_history(
@@ -149,29 +389,30 @@ class NotificationService:
         """Get notification history."""
         history = self._notification_history
         if user_id:
-            history = [n for n in history if n["user_id"] == user_id]
-        return history[-limit:]
+            history = self._history_by_user.get(user_id, [])
+        return [
+            {**entry, "timestamp": datetime.utcfromtimestamp(entry["ts"]).isoformat()}
+            for entry in history[-limit:]
+        ]
+
+    def get_notification_history_json(
+        self,
+        user_id: Optional[str] = None,
+        limit: int = 100,
+    ) -> bytes:
+        """Get notification history serialized as compact JSON."""
+        return _JSON_ENCODER.encode(self.get_notification_history(user_id, limit)).encode()
 
     def get_delivery_stats(self) -> Dict[str, Dict[str, int]]:
         """Get notification delivery statistics."""
-        stats: Dict[str, Dict[str, int]] = {}
-
-        for notification in self._notification_history:
-            for channel, success in notification["results"].items():
-                if channel not in stats:
-                    stats[channel] = {"sent": 0, "failed": 0}
-                if success:
-                    stats[channel]["sent"] += 1
-                else:
-                    stats[channel]["failed"] += 1
-
-        return stats
+        return {channel: dict(counts) for channel, counts in self._delivery_stats.items()}
 
     async def send_task_assigned_notification(
         self,
         assignee_email: str,
         task_title: str,
         assigner_name: str,
+        first_success: bool = False,
     ) -> bool:
         """Send task assignment notification."""
         subject = f"New Task Assigned: {task_title}"
@@ -181,6 +422,7 @@ class NotificationService:
             subject=subject,
             body=body,
             recipient=assignee_email,
+            first_success=first_success,
         )
         return any(results.values())
 
@@ -189,6 +431,7 @@ class NotificationService:
         assignee_email: str,
         task_title: str,
         due_date: str,
+        first_success: bool = False,
     ) -> bool:
         """Send task due date reminder."""
         subject = f"Task Due Soon: {task_title}"
@@ -198,6 +441,7 @@ class NotificationService:
             subject=subject,
             body=body,
             recipient=assignee_email,
+            first_success=first_success,
         )
         return any(results.values())
 
@@ -1,14 +1,38 @@
 """Task service - POORLY TESTED (many coverage gaps)."""
 
-from typing import Optional, List, Dict
+from typing import Iterable, Optional, List, Dict
+from collections import Counter
 from datetime import datetime, timedelta
+from itertools import islice
 from ..models.task import Task, TaskStatus, TaskPriority
 
 
+# Statuses whose tasks no longer count towards an assignee's workload
+_CLOSED_STATUSES = frozenset((TaskStatus.DONE, TaskStatus.CANCELLED))
+
+
+def _matches_filters(
+    task: Task,
+    status: Optional[TaskStatus],
+    priority: Optional[TaskPriority],
+    assignee_id: Optional[int],
+    project_id: Optional[int],
+) -> bool:
+    """Check a task's live fields against the list_tasks filters."""
+    return (
+        (status is None or task.status == status)
+        and (priority is None or task.priority == priority)
+        and (assignee_id is None or task.assignee_id == assignee_id)
+        and (project_id is None or task.project_id == project_id)
+    )
+
+
 class TaskService:
     """Service for managing tasks."""
 
     def __init__(self):
+        # Callers hold the stored Task objects and may change them directly, so
+        # queries read the tasks' live fields rather than indexes kept on write
         self._tasks: Dict[int, Task] = {}
         self._next_id = 1
 
@@ -19,6 +43,7 @@ class TaskService:
         priority: TaskPriority = TaskPriority.MEDIUM,
         assignee_id: Optional[int] = None,
         project_id: Optional[int] = None,
+        tags: Optional[List[str]] = None,
     ) -> Task:
         """Create a new task."""
         task = Task(
@@ -28,6 +53,7 @@ class TaskService:
             priority=priority,
             assignee_id=assignee_id,
             project_id=project_id,
+            tags=Task.normalize_tags(tags or ()),
         )
         self._tasks[self._next_id] = task
         self._next_id += 1
@@ -47,21 +73,13 @@ class TaskService:
         offset: int = 0,
     ) -> List[Task]:
         """List tasks with optional filters - PARTIALLY TESTED."""
-        tasks = list(self._tasks.values())
-
-        if status is not None:
-            tasks = [t for t in tasks if t.status == status]
-
-        if priority is not None:
-            tasks = [t for t in tasks if t.priority == priority]
-
-        if assignee_id is not None:
-            tasks = [t for t in tasks if t.assignee_id == assignee_id]
-
-        if project_id is not None:
-            tasks = [t for t in tasks if t.project_id == project_id]
-
-        return tasks[offset : offset + limit]
+        tasks: Iterable[Task] = self._tasks.values()
+        if any(value is not None for value in (status, priority, assignee_id, project_id)):
+            tasks = (
+                t for t in tasks if _matches_filters(t, status, priority, assignee_id, project_id)
+            )
+        # Stop as soon as the requested page is filled
+        return list(islice(tasks, offset, offset + limit))
 
     def update_task(self, task_id: int, **kwargs) -> Optional[Task]:
         """Update task fields - NOT TESTED."""
@@ -79,10 +97,7 @@ class TaskService:
 
     def delete_task(self, task_id: int) -> bool:
         """Delete a task - NOT TESTED."""
-        if task_id in self._tasks:
-            del self._tasks[task_id]
-            return True
-        return False
+        return self._tasks.pop(task_id, None) is not None
 
     def assign_task(self, task_id: int, assignee_id: int) -> Optional[Task]:
         """Assign task to user - NOT TESTED."""
@@ -112,11 +127,12 @@ class TaskService:
 
     def get_overdue_tasks(self) -> List[Task]:
         """Get all overdue tasks - NOT TESTED."""
-        return [t for t in self._tasks.values() if t.is_overdue()]
+        tasks = list(self._tasks.values())
+        return [t for t, overdue in zip(tasks, Task.bulk_overdue(tasks)) if overdue]
 
     def get_blocked_tasks(self) -> List[Task]:
         """Get all blocked tasks - NOT TESTED."""
-        return [t for t in self._tasks.values() if t.is_blocked()]
+        return [t for t in self._tasks.values() if t.status == TaskStatus.BLOCKED]
 
     def get_tasks_by_tag(self, tag: str) -> List[Task]:
         """Get tasks by tag - NOT TESTED."""
@@ -125,12 +141,14 @@ class TaskService:
 
     def bulk_assign(self, task_ids: List[int], assignee_id: int) -> Dict[int, bool]:
         """Bulk assign tasks - NOT TESTED."""
+        now = datetime.utcnow()
+        get_task = self._tasks.get
         results = {}
         for task_id in task_ids:
-            task = self.get_task(task_id)
+            task = get_task(task_id)
             if task:
                 task.assignee_id = assignee_id
-                task.updated_at = datetime.utcnow()
+                task.updated_at = now
                 results[task_id] = True
             else:
                 results[task_id] = False
@@ -138,9 +156,10 @@ class TaskService:
 
     def bulk_transition(self, task_ids: List[int], new_status: TaskStatus) -> Dict[int, bool]:
         """Bulk transition tasks - NOT TESTED."""
+        get_task = self._tasks.get
         results = {}
         for task_id in task_ids:
-            task = self.get_task(task_id)
+            task = get_task(task_id)
             if task and task.can_transition_to(new_status):
                 task.transition_to(new_status)
                 results[task_id] = True
@@ -150,12 +169,12 @@ class TaskService:
 
     def get_task_stats(self, project_id: Optional[int] = None) -> Dict[str, int]:
         """Get task statistics - NOT TESTED."""
-        tasks = self._tasks.values()
+        tasks = list(self._tasks.values())
         if project_id is not None:
             tasks = [t for t in tasks if t.project_id == project_id]
 
         stats = {
-            "total": len(list(tasks)),
+            "total": len(tasks),
             "todo": 0,
             "in_progress": 0,
             "in_review": 0,
@@ -164,32 +183,27 @@ class TaskService:
             "cancelled": 0,
             "overdue": 0,
         }
-
-        for task in self._tasks.values():
-            if project_id is not None and task.project_id != project_id:
-                continue
-            stats[task.status.value] = stats.get(task.status.value, 0) + 1
-            if task.is_overdue():
-                stats["overdue"] += 1
+        for status, count in Counter(t.status for t in tasks).items():
+            stats[status.value] = count
+        stats["overdue"] = sum(Task.bulk_overdue(tasks))
 
         return stats
 
     def calculate_velocity(self, days: int = 14) -> float:
         """Calculate team velocity - NOT TESTED."""
         cutoff = datetime.utcnow() - timedelta(days=days)
-        completed = 0
-        for task in self._tasks.values():
-            if task.completed_at and task.completed_at > cutoff:
-                completed += 1
+        completed = sum(
+            1 for t in self._tasks.values() if t.completed_at and t.completed_at > cutoff
+        )
         return completed / (days / 7)  # Tasks per week
 
     def get_workload_distribution(self) -> Dict[int, int]:
         """Get workload by assignee - NOT TESTED."""
-        distribution: Dict[int, int] = {}
-        for task in self._tasks.values():
-            if task.assignee_id and task.status not in (TaskStatus.DONE, TaskStatus.CANCELLED):
-                distribution[task.assignee_id] = distribution.get(task.assignee_id, 0) + 1
-        return distribution
+        return dict(Counter(
+            t.assignee_id
+            for t in self._tasks.values()
+            if t.assignee_id and t.status not in _CLOSED_STATUSES
+        ))
 
     def auto_assign_task(self, task_id: int, team_member_ids: List[int]) -> Optional[Task]:
         """Auto-assign task to team member with lowest workload - NOT TESTED."""
@@ -200,15 +214,9 @@ class TaskService:
         if task is None:
             return None
 
+        # min() picks the earliest listed member among equally loaded ones
         workload = self.get_workload_distribution()
-        min_load = float("inf")
-        assignee = team_member_ids[0]
-
-        for member_id in team_member_ids:
-            load = workload.get(member_id, 0)
-            if load < min_load:
-                min_load = load
-                assignee = member_id
+        assignee = min(team_member_ids, key=lambda member_id: workload.get(member_id, 0))
 
         task.assignee_id = assignee
         task.updated_at = datetime.utcnow()
@@ -75,10 +75,7 @@ class UserService:
 
     def delete_user(self, user_id: int) -> bool:
         """Delete a user."""
-        if user_id in self._users:
-            del self._users[user_id]
-            return True
-        return False
+        return self._users.pop(user_id, None) is not None
 
     def activate_user(self, user_id: int) -> Optional[User]:
         """Activate a user."""
@@ -0,0 +1,127 @@
+"""Tests for API middleware."""
+
+import time
+
+import pytest
+
+from zealous.api.middleware import AuthMiddleware, LoggingMiddleware, TokenBucketMiddleware
+
+
+def _wait_until(predicate, timeout=2.0):
+    """Poll until predicate() is true or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class TestAuthMiddleware:
+    """Test AuthMiddleware."""
+
+    @pytest.mark.parametrize("user_id", [1, -1, 2**63, 2**80])
+    def test_session_round_trip(self, user_id):
+        """Test sessions work for any integer user id."""
+        middleware = AuthMiddleware("secret")
+        token = middleware.create_session(user_id)
+        assert token != middleware.create_session(user_id)
+        assert middleware.validate_session(token) == user_id
+        assert middleware.revoke_all_sessions(user_id) == 2
+        assert middleware.validate_session(token) is None
+
+
+class TestTokenBucketMiddleware:
+    """Test TokenBucketMiddleware."""
+
+    def test_limits_after_bucket_empties(self):
+        """Test a client is limited once its tokens run out."""
+        middleware = TokenBucketMiddleware(requests_per_minute=2)
+        assert not middleware.is_rate_limited("a")
+        assert not middleware.is_rate_limited("a")
+        assert middleware.is_rate_limited("a")
+        assert middleware.get_remaining_requests("a") == 0
+        assert middleware.get_remaining_requests("b") == 2
+
+    def test_stats_forget_refilled_clients(self, monkeypatch):
+        """Test get_stats drops buckets that have refilled to capacity."""
+        now = [1000.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        middleware = TokenBucketMiddleware(requests_per_minute=60)
+        for _ in range(60):
+            middleware.is_rate_limited("busy")
+        middleware.is_rate_limited("idle")
+
+        assert middleware.get_stats()["tracked_clients"] == 2
+        assert middleware.get_stats()["limited_clients"] == 1
+
+        now[0] += 1.0
+        stats = middleware.get_stats()
+        assert stats["tracked_clients"] == 1
+        assert stats["limited_clients"] == 0
+        assert middleware.get_remaining_requests("idle") == 60
+
+        now[0] += 60.0
+        assert middleware.get_stats()["tracked_clients"] == 0
+        assert middleware.get_remaining_requests("busy") == 60
+
+
+class TestLoggingMiddleware:
+    """Test LoggingMiddleware."""
+
+    def test_close_stops_flusher(self):
+        """Test close writes buffered lines and stops the flush thread."""
+        lines = []
+        middleware = LoggingMiddleware(log_function=lines.append, flush_interval=60)
+        middleware.log_request("GET", "/tasks", "client", 200, 1.5)
+        flusher = middleware._flusher
+
+        middleware.close()
+        assert not flusher.is_alive()
+        assert len(lines) == 1
+        assert "GET /tasks - 200" in lines[0]
+
+        middleware.close()
+        assert len(lines) == 1
+
+    @pytest.mark.parametrize("flush_interval", [0, -1.0])
+    def test_invalid_flush_interval_rejected(self, flush_interval):
+        """Test a flush interval that would spin the flush thread is rejected."""
+        with pytest.raises(ValueError):
+            LoggingMiddleware(flush_interval=flush_interval)
+
+    def test_flush_writes_in_batches(self):
+        """Test flush joins buffered lines into batches of max_batch_size."""
+        batches = []
+        middleware = LoggingMiddleware(
+            log_function=batches.append, flush_interval=60, max_batch_size=2
+        )
+        middleware._pending_lines.extend(["a", "b", "c"])
+
+        assert middleware.flush() == 3
+        assert batches == ["a\nb", "c"]
+        assert middleware.flush() == 0
+        middleware.close()
+
+    def test_flusher_survives_log_function_error(self):
+        """Test a failing log_function does not stop later lines being written."""
+        lines = []
+
+        def log_function(line):
+            if not lines:
+                lines.append(None)
+                raise OSError("disk full")
+            lines.append(line)
+
+        middleware = LoggingMiddleware(
+            log_function=log_function, flush_interval=60, max_batch_size=1
+        )
+        middleware.log_request("GET", "/first", "client", 200, 1.0)
+        assert _wait_until(lambda: lines == [None])
+        flusher = middleware._flusher
+
+        middleware.log_request("GET", "/second", "client", 200, 1.0)
+        assert _wait_until(lambda: len(lines) == 2)
+        assert "GET /second - 200" in lines[1]
+        assert flusher.is_alive()
+        middleware.close()
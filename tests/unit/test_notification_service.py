@@ -0,0 +1,296 @@
+"""Tests for notification service."""
+
+import asyncio
+
+import pytest
+
+from zealous.services.notification_service import NotificationChannel, NotificationService
+
+
+class RecordingChannel(NotificationChannel):
+    """Channel that records each recipient it sends to."""
+
+    __slots__ = ("sent",)
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, recipient: str, subject: str, body: str) -> bool:
+        """Record the send."""
+        self.sent.append(recipient)
+        return True
+
+
+class FailingChannel(NotificationChannel):
+    """Channel that fails a set number of sends before succeeding."""
+
+    __slots__ = ("failures", "attempts")
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.attempts = 0
+
+    async def send(self, recipient: str, subject: str, body: str) -> bool:
+        """Fail until the failures are used up."""
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise ConnectionError("channel down")
+        return True
+
+
+class GatedChannel(NotificationChannel):
+    """Channel whose sends block until the gate opens."""
+
+    __slots__ = ("gate", "started", "active", "peak")
+
+    def __init__(self):
+        self.gate = asyncio.Event()
+        self.started = 0
+        self.active = 0
+        self.peak = 0
+
+    async def send(self, recipient: str, subject: str, body: str) -> bool:
+        """Wait for the gate, tracking how many sends overlap."""
+        self.started += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await self.gate.wait()
+        finally:
+            self.active -= 1
+        return True
+
+
+async def _settle():
+    """Let every ready task run until it blocks."""
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+class TestIdempotency:
+    """Test sends made with an idempotency key."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_same_key_sends_once(self):
+        """Test concurrent sends with one key share a single delivery."""
+        service = NotificationService()
+        channel = GatedChannel()
+        service.register_channel("email", channel)
+
+        sends = [
+            asyncio.ensure_future(service.send_notification(
+                "u", "s", "b", "r", channels=["email"], idempotency_key="k"
+            ))
+            for _ in range(3)
+        ]
+        await _settle()
+        channel.gate.set()
+
+        assert await asyncio.gather(*sends) == [{"email": True}] * 3
+        assert channel.started == 1
+        assert len(service.get_notification_history()) == 1
+
+    @pytest.mark.asyncio
+    async def test_retry_only_resends_failed_channels(self):
+        """Test a retry with the same key skips channels that already delivered."""
+        service = NotificationService()
+        email = RecordingChannel()
+        sms = FailingChannel(failures=1)
+        service.register_channel("email", email)
+        service.register_channel("sms", sms)
+
+        first = await service.send_notification(
+            "u", "s", "b", "r", channels=["email", "sms"], idempotency_key="k"
+        )
+        assert first == {"email": True, "sms": False}
+
+        retry = await service.send_notification(
+            "u", "s", "b", "r", channels=["email", "sms"], idempotency_key="k"
+        )
+        assert retry == {"email": True, "sms": True}
+        assert email.sent == ["r"]
+        assert sms.attempts == 2
+
+        again = await service.send_notification(
+            "u", "s", "b", "r", channels=["email", "sms"], idempotency_key="k"
+        )
+        assert again == {"email": True, "sms": True}
+        assert email.sent == ["r"]
+        assert sms.attempts == 2
+
+    @pytest.mark.asyncio
+    async def test_waiter_takes_over_when_owner_cancelled(self):
+        """Test a send waiting on a cancelled send with the same key delivers itself."""
+        service = NotificationService()
+        channel = GatedChannel()
+        service.register_channel("email", channel)
+
+        owner = asyncio.ensure_future(service.send_notification(
+            "u", "s", "b", "r", channels=["email"], idempotency_key="k"
+        ))
+        await _settle()
+        waiter = asyncio.ensure_future(service.send_notification(
+            "u", "s", "b", "r", channels=["email"], idempotency_key="k"
+        ))
+        await _settle()
+        owner.cancel()
+        await _settle()
+        channel.gate.set()
+
+        assert await asyncio.wait_for(waiter, timeout=1) == {"email": True}
+        assert owner.cancelled()
+        assert channel.started == 2
+        assert service._idempotent_in_flight == {}
+
+
+class TestBulk:
+    """Test bulk sends."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_skips_users_without_recipient(self):
+        """Test bulk sends reach each user with a recipient address."""
+        service = NotificationService()
+        email = RecordingChannel()
+        service.register_channel("email", email)
+
+        results = await service.send_bulk_notification(
+            ["a", "b", "c"], "s", "b", {"a": "a@x", "c": "c@x"}
+        )
+        assert results == {"a": {"email": True}, "c": {"email": True}}
+        assert sorted(email.sent) == ["a@x", "c@x"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_retry_skips_users_already_sent(self):
+        """Test a keyed bulk retry only resends to users whose send failed."""
+        service = NotificationService()
+        email = RecordingChannel()
+        sms = FailingChannel(failures=1)
+        service.register_channel("email", email)
+        service.register_channel("sms", sms)
+        service.set_user_preferences("b", ["sms"])
+        recipients = {"a": "a@x", "b": "b@x"}
+
+        first = await service.send_bulk_notification(
+            ["a", "b"], "s", "b", recipients, idempotency_key="k"
+        )
+        assert first == {"a": {"email": True}, "b": {"sms": False}}
+
+        retry = await service.send_bulk_notification(
+            ["a", "b"], "s", "b", recipients, idempotency_key="k"
+        )
+        assert retry == {"a": {"email": True}, "b": {"sms": True}}
+        assert email.sent == ["a@x"]
+        assert sms.attempts == 2
+
+
+class TestFirstSuccess:
+    """Test first_success sends."""
+
+    @pytest.mark.asyncio
+    async def test_stops_after_first_delivery(self):
+        """Test the remaining channels are cancelled once one delivers."""
+        service = NotificationService()
+        email = RecordingChannel()
+        slow = GatedChannel()
+        service.register_channel("email", email)
+        service.register_channel("sms", slow)
+
+        results = await service.send_notification(
+            "u", "s", "b", "r", channels=["sms", "email", "fax"], first_success=True
+        )
+        assert results == {"email": True, "fax": False}
+        await _settle()
+        assert slow.active == 0
+        assert not slow.gate.is_set()
+
+    @pytest.mark.asyncio
+    async def test_tries_every_channel_when_all_fail(self):
+        """Test every channel is reported when none delivers."""
+        service = NotificationService()
+        service.register_channel("email", FailingChannel(failures=1))
+        service.register_channel("sms", FailingChannel(failures=1))
+
+        results = await service.send_notification(
+            "u", "s", "b", "r", channels=["email", "sms"], first_success=True
+        )
+        assert results == {"email": False, "sms": False}
+
+
+class TestAdmission:
+    """Test the max_concurrency admission limit."""
+
+    def test_invalid_max_concurrency_rejected(self):
+        """Test a limit below one is rejected."""
+        with pytest.raises(ValueError):
+            NotificationService(max_concurrency=0)
+
+    @pytest.mark.asyncio
+    async def test_limits_overlapping_sends(self):
+        """Test no more than max_concurrency sends are delivered at once."""
+        service = NotificationService(max_concurrency=2)
+        channel = GatedChannel()
+        service.register_channel("email", channel)
+
+        sends = asyncio.ensure_future(service.send_bulk_notification(
+            ["a", "b", "c", "d"], "s", "b", {u: u for u in "abcd"}
+        ))
+        await _settle()
+        assert channel.started == 2
+
+        await service.set_max_concurrency(3)
+        await _settle()
+        assert channel.started == 3
+
+        channel.gate.set()
+        assert len(await sends) == 4
+        assert channel.peak == 3
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_passes_on_wakeup(self):
+        """Test a waiter cancelled right after being woken does not strand the next one."""
+        service = NotificationService(max_concurrency=1)
+        admitted = []
+
+        async def wait_for_slot(name):
+            async with service._admitted():
+                admitted.append(name)
+
+        async with service._admitted():
+            first = asyncio.ensure_future(wait_for_slot("first"))
+            second = asyncio.ensure_future(wait_for_slot("second"))
+            await asyncio.sleep(0)
+        # Releasing the slot wakes the first waiter, which is cancelled before it runs
+        first.cancel()
+
+        await asyncio.wait_for(second, timeout=1)
+        assert admitted == ["second"]
+        assert first.cancelled()
+
+
+class TestChannelLimits:
+    """Test per-channel rate limits."""
+
+    @pytest.mark.parametrize("limit", [(0, 1.0), (1, 0), (1, -1.0)])
+    def test_invalid_limits_rejected(self, limit):
+        """Test limits that could never admit a send are rejected up front."""
+        with pytest.raises(ValueError):
+            NotificationService(channel_limits={"sms": limit})
+
+    @pytest.mark.asyncio
+    async def test_throttled_channel_does_not_hold_slot(self):
+        """Test a send waiting on its rate window leaves the slot to other sends."""
+        service = NotificationService(max_concurrency=1, channel_limits={"sms": (1, 0.2)})
+        sms = RecordingChannel()
+        email = RecordingChannel()
+        service.register_channel("sms", sms)
+        service.register_channel("email", email)
+        order = []
+
+        async def send(recipient, channel):
+            await service.send_notification("u", "s", "b", recipient, channels=[channel])
+            order.append(recipient)
+
+        await send("first", "sms")
+        await asyncio.gather(send("second", "sms"), send("third", "email"))
+        assert order == ["first", "third", "second"]
+        assert sms.sent == ["first", "second"]
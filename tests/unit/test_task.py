@@ -37,6 +37,18 @@ class TestTask:
         )
         assert task.is_overdue() is True
 
+    def test_bulk_overdue_matches_is_overdue(self):
+        """Test bulk_overdue agrees with is_overdue per task."""
+        past = datetime.utcnow() - timedelta(days=1)
+        tasks = [
+            Task(title="No due date"),
+            Task(title="Done", status=TaskStatus.DONE, due_date=past),
+            Task(title="Overdue", due_date=past),
+            Task(title="Upcoming", due_date=datetime.utcnow() + timedelta(days=1)),
+        ]
+        assert Task.bulk_overdue(tasks) == [t.is_overdue() for t in tasks]
+        assert Task.bulk_overdue(tasks) == [False, False, True, False]
+
     def test_is_blocked(self):
         """Test is_blocked method."""
         task = Task(title="Test", status=TaskStatus.BLOCKED)
@@ -57,6 +69,12 @@ class TestTask:
         assert task.can_transition_to(TaskStatus.CANCELLED) is True
         assert task.can_transition_to(TaskStatus.DONE) is False
 
+    def test_can_transition_to_terminal_states(self):
+        """Test done and cancelled tasks cannot transition."""
+        for status in (TaskStatus.DONE, TaskStatus.CANCELLED):
+            task = Task(title="Test", status=status)
+            assert not any(task.can_transition_to(s) for s in TaskStatus)
+
     def test_transition_to_success(self):
         """Test successful transition."""
         task = Task(title="Test", status=TaskStatus.TODO)
@@ -68,6 +86,7 @@ class TestTask:
         task = Task(title="Test", status=TaskStatus.IN_REVIEW)
         task.transition_to(TaskStatus.DONE)
         assert task.completed_at is not None
+        assert task.completed_at == task.updated_at
 
     def test_transition_to_invalid_raises(self):
         """Test invalid transition raises error."""
@@ -75,5 +94,78 @@ class TestTask:
         with pytest.raises(ValueError):
             task.transition_to(TaskStatus.DONE)
 
-    # NOTE: add_subtask, remove_subtask, add_tag, remove_tag are NOT tested
-    # NOTE: estimate_completion_date, calculate_progress are NOT tested
+    def test_add_tag_normalizes_and_dedupes(self):
+        """Test add_tag normalizes tags and skips duplicates."""
+        task = Task(title="Test", tags=["backend"])
+        task.add_tag(" Backend ")
+        task.add_tag("API")
+        assert task.tags == ["backend", "api"]
+
+    def test_add_tags(self):
+        """Test add_tags normalizes, dedupes and keeps order."""
+        task = Task(title="Test", tags=["api"])
+        task.add_tags(["UI", "api", " ui", "", "db"])
+        assert task.tags == ["api", "ui", "db"]
+        assert task.updated_at is not None
+
+    def test_normalize_tags(self):
+        """Test normalize_tags lowercases, strips and dedupes in order."""
+        assert Task.normalize_tags([" Backend ", "api", "BACKEND", ""]) == ["backend", "api"]
+
+    def test_tags_follow_field_assignment(self):
+        """Test tag helpers see tags assigned or copied in directly."""
+        task = Task(title="Test")
+        task.add_tag("old")
+        task.tags = ["a", "b"]
+        task.add_tag("a")
+        task.remove_tag("a")
+        assert task.tags == ["b"]
+
+        task.tags.clear()
+        task.remove_tag("old")
+        assert task.tags == []
+
+        copy = task.model_copy(update={"tags": ["q"]})
+        copy.remove_tag("Q")
+        assert copy.tags == []
+
+    def test_remove_tag(self):
+        """Test remove_tag method."""
+        task = Task(title="Test", tags=["backend", "api"])
+        task.remove_tag("BACKEND")
+        assert task.tags == ["api"]
+
+        task.add_tag("backend")
+        assert task.tags == ["api", "backend"]
+
+    def test_add_and_remove_subtask(self):
+        """Test subtask methods dedupe and keep order."""
+        task = Task(title="Test", subtask_ids=[1])
+        task.add_subtask(1)
+        task.add_subtask(2)
+        assert task.subtask_ids == [1, 2]
+
+        task.remove_subtask(1)
+        task.add_subtask(1)
+        assert task.subtask_ids == [2, 1]
+
+        task.subtask_ids = [5]
+        task.remove_subtask(5)
+        task.add_subtask(2)
+        assert task.subtask_ids == [2]
+
+    def test_calculate_progress(self):
+        """Test progress from status and from tracked hours."""
+        assert Task(title="Test", status=TaskStatus.DONE).calculate_progress() == 100.0
+        assert Task(title="Test", status=TaskStatus.IN_REVIEW).calculate_progress() == 75.0
+        assert Task(title="Test", status=TaskStatus.CANCELLED).calculate_progress() == 0.0
+
+        task = Task(
+            title="Test",
+            status=TaskStatus.IN_PROGRESS,
+            estimated_hours=10.0,
+            actual_hours=20.0,
+        )
+        assert task.calculate_progress() == 99.0
+
+    # NOTE: estimate_completion_date is NOT tested
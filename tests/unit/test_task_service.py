@@ -1,6 +1,7 @@
 """Tests for TaskService - LOW COVERAGE."""
 
 import pytest
+from datetime import datetime, timedelta
 from zealous.services.task_service import TaskService
 from zealous.models.task import TaskStatus, TaskPriority
 
@@ -35,8 +36,153 @@ class TestTaskService:
         tasks = service.list_tasks()
         assert len(tasks) == 2
 
-    # NOTE: update_task, delete_task, assign_task, unassign_task,
-    # transition_task, get_overdue_tasks, get_blocked_tasks,
-    # get_tasks_by_tag, bulk_assign, bulk_transition, get_task_stats,
-    # calculate_velocity, get_workload_distribution, auto_assign_task
-    # are ALL NOT TESTED
+    def test_list_tasks_filters(self):
+        """Test filtered listing follows assignments and keeps creation order."""
+        service = TaskService()
+        first = service.create_task("Task 1", priority=TaskPriority.HIGH, project_id=1)
+        service.create_task("Task 2", project_id=2)
+        third = service.create_task("Task 3", priority=TaskPriority.HIGH, project_id=1)
+
+        service.assign_task(third.id, 7)
+        service.assign_task(first.id, 7)
+
+        tasks = service.list_tasks(priority=TaskPriority.HIGH, assignee_id=7, project_id=1)
+        assert [t.id for t in tasks] == [first.id, third.id]
+
+        service.unassign_task(first.id)
+        assert [t.id for t in service.list_tasks(assignee_id=7)] == [third.id]
+        assert service.list_tasks(status=TaskStatus.DONE) == []
+
+    def test_get_task_stats(self):
+        """Test stats follow transitions and deletes, overall and per project."""
+        service = TaskService()
+        first = service.create_task("Task 1", project_id=1)
+        second = service.create_task("Task 2", project_id=1)
+        service.create_task("Task 3", project_id=2)
+
+        service.transition_task(first.id, TaskStatus.IN_PROGRESS)
+        service.delete_task(second.id)
+
+        stats = service.get_task_stats()
+        assert stats["total"] == 2
+        assert stats["todo"] == 1
+        assert stats["in_progress"] == 1
+
+        stats = service.get_task_stats(project_id=1)
+        assert stats["total"] == 1
+        assert stats["todo"] == 0
+        assert stats["in_progress"] == 1
+
+    def test_list_tasks_sees_direct_task_changes(self):
+        """Test filters match the live fields of tasks changed outside the service."""
+        service = TaskService()
+        task = service.create_task("Task 1", project_id=1)
+        task.transition_to(TaskStatus.IN_PROGRESS)
+
+        assert service.list_tasks(status=TaskStatus.TODO) == []
+        assert service.list_tasks(status=TaskStatus.IN_PROGRESS) == [task]
+
+        task.assignee_id = 4
+        task.priority = TaskPriority.HIGH
+        assert service.list_tasks(assignee_id=4, priority=TaskPriority.HIGH) == [task]
+
+        task.transition_to(TaskStatus.BLOCKED)
+        assert service.get_blocked_tasks() == [task]
+        task.transition_to(TaskStatus.IN_PROGRESS)
+
+        stats = service.get_task_stats(project_id=1)
+        assert stats["todo"] == 0
+        assert stats["in_progress"] == 1
+
+        service.transition_task(task.id, TaskStatus.IN_REVIEW)
+        assert service.list_tasks(status=TaskStatus.TODO) == []
+        assert service.list_tasks(status=TaskStatus.IN_REVIEW) == [task]
+
+        stats = service.get_task_stats(project_id=1)
+        assert stats["todo"] == 0
+        assert stats["in_progress"] == 0
+        assert stats["in_review"] == 1
+
+    def test_workload_follows_direct_task_changes(self):
+        """Test workload counts open tasks by their live assignee and status."""
+        service = TaskService()
+        task = service.create_task("Task 1", assignee_id=3)
+        other = service.create_task("Task 2", assignee_id=5)
+        task.assignee_id = 9
+        assert service.get_workload_distribution() == {9: 1, 5: 1}
+
+        for status in (TaskStatus.IN_PROGRESS, TaskStatus.IN_REVIEW, TaskStatus.DONE):
+            other.transition_to(status)
+        assert service.get_workload_distribution() == {9: 1}
+
+        third = service.create_task("Task 3")
+        service.auto_assign_task(third.id, [9, 5])
+        assert third.assignee_id == 5
+
+    def test_listings_follow_writes(self):
+        """Test listings reflect writes and are safe to modify."""
+        service = TaskService()
+        task = service.create_task("Task 1", project_id=1)
+
+        tasks = service.list_tasks(project_id=1)
+        tasks.clear()
+        assert service.list_tasks(project_id=1) == [task]
+
+        service.transition_task(task.id, TaskStatus.IN_PROGRESS)
+        service.transition_task(task.id, TaskStatus.BLOCKED)
+        assert service.get_blocked_tasks() == [task]
+        assert service.list_tasks(status=TaskStatus.TODO) == []
+
+        second = service.create_task("Task 2", project_id=1)
+        assert service.list_tasks(project_id=1) == [task, second]
+
+        assert service.get_blocked_tasks() == [task]
+        assert service.list_tasks(status=TaskStatus.BLOCKED) == [task]
+        task.transition_to(TaskStatus.IN_PROGRESS)
+        assert service.get_blocked_tasks() == []
+        assert service.list_tasks(status=TaskStatus.BLOCKED) == []
+
+    def test_get_tasks_by_tag(self):
+        """Test tag lookup sees creation tags and tags added later."""
+        service = TaskService()
+        first = service.create_task("Task 1", tags=["Backend", " api"])
+        second = service.create_task("Task 2")
+        second.add_tag("API")
+
+        assert service.get_tasks_by_tag(" API ") == [first, second]
+        assert service.get_tasks_by_tag("backend") == [first]
+        assert service.get_tasks_by_tag("ui") == []
+
+        second.tags = ["ui"]
+        assert service.get_tasks_by_tag("UI") == [second]
+
+    def test_get_overdue_tasks(self):
+        """Test overdue tasks follow due dates set directly or through the service."""
+        service = TaskService()
+        first = service.create_task("Task 1")
+        second = service.create_task("Task 2")
+        past = datetime.utcnow() - timedelta(days=1)
+
+        first.due_date = past
+        service.update_task(second.id, due_date=past)
+        assert service.get_overdue_tasks() == [first, second]
+        assert service.get_task_stats()["overdue"] == 2
+
+        second.due_date = datetime.utcnow() + timedelta(days=1)
+        assert service.get_overdue_tasks() == [first]
+
+    def test_calculate_velocity(self):
+        """Test velocity counts tasks completed directly or through the service."""
+        service = TaskService()
+        first = service.create_task("Task 1")
+        second = service.create_task("Task 2")
+        service.create_task("Task 3")
+
+        for status in (TaskStatus.IN_PROGRESS, TaskStatus.IN_REVIEW, TaskStatus.DONE):
+            first.transition_to(status)
+            service.transition_task(second.id, status)
+
+        assert service.calculate_velocity(days=7) == 2.0
+        assert service.calculate_velocity(days=14) == 1.0
+
+    # NOTE: update_task, bulk_assign, bulk_transition are ALL NOT TESTED